@@ -1,5 +1,7 @@
 """Streamlit UI for the arXiv RAG application."""
 
+import html
+
 import streamlit as st
 from datetime import datetime
 
@@ -9,6 +11,7 @@ from src.embeddings import embedder
 from src.rag import rag
 from src.ingest import ingestor
 from src.arxiv_fetcher import POPULAR_CATEGORIES
+from src.ui_css import CSS_STYLE_TAG
 
 
 # Page configuration
@@ -19,176 +22,27 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Custom CSS for styling
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;600&family=Outfit:wght@300;400;600;700&display=swap');
-    
-    :root {
-        --bg-primary: #0d1117;
-        --bg-secondary: #161b22;
-        --bg-tertiary: #21262d;
-        --accent-cyan: #58a6ff;
-        --accent-purple: #bc8cff;
-        --accent-green: #3fb950;
-        --accent-orange: #d29922;
-        --text-primary: #e6edf3;
-        --text-secondary: #8b949e;
-        --border-color: #30363d;
-    }
-    
-    .stApp {
-        background: linear-gradient(135deg, var(--bg-primary) 0%, #0a0f14 100%);
-    }
-    
-    .main-header {
-        font-family: 'Outfit', sans-serif;
-        font-weight: 700;
-        font-size: 3rem;
-        background: linear-gradient(135deg, var(--accent-cyan) 0%, var(--accent-purple) 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-bottom: 0.5rem;
-    }
-    
-    .sub-header {
-        font-family: 'Outfit', sans-serif;
-        color: var(--text-secondary);
-        font-size: 1.1rem;
-        margin-bottom: 2rem;
-    }
-    
-    .paper-card {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border-color);
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin-bottom: 1rem;
-        transition: all 0.3s ease;
-    }
-    
-    .paper-card:hover {
-        border-color: var(--accent-cyan);
-        box-shadow: 0 0 20px rgba(88, 166, 255, 0.1);
-    }
-    
-    .paper-title {
-        font-family: 'Outfit', sans-serif;
-        font-weight: 600;
-        color: var(--text-primary);
-        font-size: 1.1rem;
-        margin-bottom: 0.5rem;
-    }
-    
-    .paper-meta {
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 0.75rem;
-        color: var(--accent-cyan);
-        margin-bottom: 0.75rem;
-    }
-    
-    .paper-abstract {
-        color: var(--text-secondary);
-        font-size: 0.9rem;
-        line-height: 1.6;
-    }
-    
-    .similarity-badge {
-        display: inline-block;
-        background: linear-gradient(135deg, var(--accent-green) 0%, #238636 100%);
-        color: white;
-        padding: 0.25rem 0.75rem;
-        border-radius: 20px;
-        font-size: 0.75rem;
-        font-weight: 600;
-        font-family: 'JetBrains Mono', monospace;
-    }
-    
-    .stat-card {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border-color);
-        border-radius: 12px;
-        padding: 1.5rem;
-        text-align: center;
-    }
-    
-    .stat-value {
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 2.5rem;
-        font-weight: 600;
-        color: var(--accent-cyan);
-    }
-    
-    .stat-label {
-        font-family: 'Outfit', sans-serif;
-        color: var(--text-secondary);
-        font-size: 0.9rem;
-    }
-    
-    .answer-box {
-        background: var(--bg-secondary);
-        border: 1px solid var(--accent-purple);
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-    }
-    
-    .source-tag {
-        display: inline-block;
-        background: var(--bg-tertiary);
-        border: 1px solid var(--border-color);
-        color: var(--accent-orange);
-        padding: 0.25rem 0.5rem;
-        border-radius: 6px;
-        font-size: 0.7rem;
-        font-family: 'JetBrains Mono', monospace;
-        margin-right: 0.5rem;
-        margin-bottom: 0.25rem;
-    }
-    
-    div[data-testid="stSidebar"] {
-        background: var(--bg-secondary);
-        border-right: 1px solid var(--border-color);
-    }
-    
-    .stTextInput > div > div > input {
-        background: var(--bg-tertiary);
-        border: 1px solid var(--border-color);
-        color: var(--text-primary);
-        border-radius: 8px;
-    }
-    
-    .stTextArea > div > div > textarea {
-        background: var(--bg-tertiary);
-        border: 1px solid var(--border-color);
-        color: var(--text-primary);
-        border-radius: 8px;
-    }
-    
-    .stSelectbox > div > div {
-        background: var(--bg-tertiary);
-        border: 1px solid var(--border-color);
-        border-radius: 8px;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, var(--accent-cyan) 0%, var(--accent-purple) 100%);
-        color: white;
-        border: none;
-        border-radius: 8px;
-        font-family: 'Outfit', sans-serif;
-        font-weight: 600;
-        padding: 0.5rem 1.5rem;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 20px rgba(88, 166, 255, 0.3);
-    }
-</style>
-""", unsafe_allow_html=True)
+# Paper card markup; title and abstract are escaped, meta is trusted HTML
+PAPER_CARD = """<div class="paper-card">
+<div class="paper-title">{title}</div>
+<div class="paper-meta">{meta}</div>
+<div class="paper-abstract">{abstract}...</div>
+</div>"""
+
+
+def paper_card(title: str, meta: str, abstract: str) -> str:
+    """Build the HTML for one paper card."""
+    return PAPER_CARD.format(title=html.escape(title), meta=meta, abstract=html.escape(abstract))
+
+
+def render_paper_cards(cards: list[str]):
+    """Render all paper cards with a single markdown element."""
+    st.markdown("\n".join(cards), unsafe_allow_html=True)
+
+
+def inject_css():
+    """Inject the pre-minified custom CSS (must be re-emitted on every rerun)."""
+    st.markdown(CSS_STYLE_TAG, unsafe_allow_html=True)
 
 
 def init_session_state():
@@ -199,8 +53,9 @@ def init_session_state():
         st.session_state.chat_history = []
 
 
-def check_services():
-    """Check if required services are available."""
+@st.cache_resource(ttl=60)
+def _check_services():
+    """Check if required services are available (shared across sessions for a minute)."""
     issues = []
     
     # Check database
@@ -227,6 +82,20 @@ def check_services():
     return issues
 
 
+def check_services():
+    """Check services, caching only a clean result so outages are re-checked on the next run."""
+    issues = _check_services()
+    if issues:
+        _check_services.clear()
+    return issues
+
+
+@st.cache_data(ttl=10)
+def get_paper_count() -> int:
+    """Get the number of indexed papers, cached briefly across reruns."""
+    return db.get_paper_count()
+
+
 def render_sidebar():
     """Render the sidebar with navigation and settings."""
     with st.sidebar:
@@ -247,6 +116,15 @@ def render_sidebar():
         st.text(f"Embed Model: {Config.OLLAMA_EMBED_MODEL}")
         st.text(f"LLM Model: {Config.OLLAMA_LLM_MODEL}")
         st.text(f"Top-K Results: {Config.TOP_K_RESULTS}")
+        st.slider(
+            "HNSW ef_search",
+            min_value=10,
+            max_value=1000,
+            value=db.ef_search,
+            step=10,
+            key="ef_search",
+            help="Candidate list size for vector search. Higher values improve recall at the cost of latency.",
+        )
         
         return page
 
@@ -258,7 +136,7 @@ def render_query_page():
     
     # Check paper count
     try:
-        paper_count = db.get_paper_count()
+        paper_count = get_paper_count()
     except:
         paper_count = 0
         
@@ -284,7 +162,7 @@ def render_query_page():
     if search_button and query:
         with st.spinner("Searching relevant papers..."):
             # Get relevant papers
-            papers = rag.retrieve(query, top_k)
+            papers = rag.retrieve(query, top_k, st.session_state.ef_search)
             
         if not papers:
             st.error("No relevant papers found for your query.")
@@ -292,35 +170,27 @@ def render_query_page():
             
         # Show sources first
         with st.expander("Retrieved Sources", expanded=True):
-            for paper in papers:
-                similarity_pct = paper.get("similarity", 0) * 100
-                st.markdown(f"""
-                <div class="paper-card">
-                    <div class="paper-title">{paper['title']}</div>
-                    <div class="paper-meta">
-                        arXiv:{paper['arxiv_id']} · 
-                        <span class="similarity-badge">{similarity_pct:.1f}% match</span>
-                    </div>
-                    <div class="paper-abstract">{paper['abstract'][:400]}...</div>
-                </div>
-                """, unsafe_allow_html=True)
+            render_paper_cards([
+                paper_card(
+                    paper["title"],
+                    f"arXiv:{html.escape(paper['arxiv_id'])} · "
+                    f'<span class="similarity-badge">{paper.get("similarity", 0) * 100:.1f}% match</span>',
+                    paper["abstract"][:400],
+                )
+                for paper in papers
+            ])
                 
-        # Generate answer
-        with st.spinner("Generating answer..."):
-            result = rag.query(query, top_k)
-            
+        # Stream the answer as it is generated, reusing the retrieved papers
         st.markdown("### Answer")
-        st.markdown(f"""
-        <div class="answer-box">
-            {result['answer']}
-        </div>
-        """, unsafe_allow_html=True)
-        
+        with st.container(border=True):
+            st.write_stream(rag.query_stream(query, papers=papers))
+            
         # Source citations
         st.markdown("**Sources cited:**")
-        for source in result['sources']:
-            st.markdown(f'<span class="source-tag">arXiv:{source["arxiv_id"]}</span>', unsafe_allow_html=True)
-
+        st.markdown(
+            "".join(f'<span class="source-tag">arXiv:{paper["arxiv_id"]}</span>' for paper in papers),
+            unsafe_allow_html=True,
+        )
 
 def render_ingest_page():
     """Render the paper ingestion page."""
@@ -355,6 +225,7 @@ def render_ingest_page():
                     
                 progress_bar.progress(1.0)
                 status_text.empty()
+                get_paper_count.clear()
                 
                 st.success(f"""
                 Ingestion complete!
@@ -392,6 +263,7 @@ def render_ingest_page():
                 
             progress_bar.progress(1.0)
             status_text.empty()
+            get_paper_count.clear()
             
             st.success(f"""
             Ingestion complete!
@@ -407,13 +279,13 @@ def render_stats_page():
     st.markdown('<p class="sub-header">Overview of your indexed research papers</p>', unsafe_allow_html=True)
     
     try:
-        paper_count = db.get_paper_count()
+        paper_count = get_paper_count()
     except Exception as e:
         st.error(f"Error connecting to database: {e}")
         return
         
     # Stats cards
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.markdown(f"""
@@ -439,6 +311,26 @@ def render_stats_page():
         </div>
         """, unsafe_allow_html=True)
         
+    with col4:
+        cache_stats = db.cache.stats()
+        st.markdown(f"""
+        <div class="stat-card">
+            <div class="stat-value">{cache_stats['hit_rate'] * 100:.0f}%</div>
+            <div class="stat-label">Query Cache Hits ({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']})</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+    # The HNSW graph is sized for the paper count when it is built
+    with st.expander("Search Index"):
+        st.caption(
+            "Rebuild the vector index with graph parameters sized for the current "
+            "number of papers. Searches and ingestion keep working during the rebuild."
+        )
+        if st.button("Rebuild Index"):
+            with st.spinner("Rebuilding search index..."):
+                db.build_index(concurrently=True)
+            st.success("Search index is up to date")
+            
     st.divider()
     
     # Recent papers
@@ -447,6 +339,7 @@ def render_stats_page():
     if paper_count > 0:
         papers = db.get_all_papers(limit=20)
         
+        cards = []
         for paper in papers:
             authors = ", ".join(paper["authors"][:3]) if paper["authors"] else "Unknown"
             if paper["authors"] and len(paper["authors"]) > 3:
@@ -454,21 +347,20 @@ def render_stats_page():
             
             pub_date = paper["published_date"].strftime("%Y-%m-%d") if paper["published_date"] else "N/A"
             
-            st.markdown(f"""
-            <div class="paper-card">
-                <div class="paper-title">{paper['title']}</div>
-                <div class="paper-meta">
-                    arXiv:{paper['arxiv_id']} · {pub_date} · {authors}
-                </div>
-                <div class="paper-abstract">{paper['abstract'][:300]}...</div>
-            </div>
-            """, unsafe_allow_html=True)
+            cards.append(paper_card(
+                paper["title"],
+                html.escape(f"arXiv:{paper['arxiv_id']} · {pub_date} · {authors}"),
+                paper["abstract_preview"],
+            ))
+            
+        render_paper_cards(cards)
     else:
         st.info("No papers indexed yet. Go to 'Ingest Papers' to add some papers.")
 
 
 def main():
     """Main application entry point."""
+    inject_css()
     init_session_state()
     
     # Check services on first run
@@ -1,9 +1,23 @@
 """ArXiv paper fetcher module."""
 
+import asyncio
+import itertools
+import time
 import arxiv
-from typing import Generator
+import feedparser
+import httpx
+import numpy as np
+from typing import AsyncGenerator, Generator, Optional
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+
+from .config import Config
+
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 @dataclass
@@ -17,6 +31,55 @@ class Paper:
     published_date: datetime
 
 
+@dataclass
+class PaperBatch:
+    """Column-oriented batch of papers for bulk embedding and insertion."""
+    arxiv_ids: list[str]
+    titles: list[str]
+    abstracts: list[str]
+    authors: list[list[str]]
+    categories: list[list[str]]
+    dates: np.ndarray  # datetime64[s], UTC
+    embeddings: Optional[np.ndarray] = None  # (N, EMBEDDING_DIM) float32
+    
+    @classmethod
+    def from_papers(cls, papers: list[Paper]) -> "PaperBatch":
+        """Build a batch by filling each column from a list of papers."""
+        return cls(
+            arxiv_ids=[p.arxiv_id for p in papers],
+            titles=[p.title for p in papers],
+            abstracts=[p.abstract for p in papers],
+            authors=[p.authors for p in papers],
+            categories=[p.categories for p in papers],
+            dates=np.array(
+                [_to_naive_utc(p.published_date) for p in papers],
+                dtype="datetime64[s]",
+            ),
+        )
+        
+    def __len__(self) -> int:
+        return len(self.arxiv_ids)
+        
+    def take(self, indices: list[int]) -> "PaperBatch":
+        """Return a new batch containing only the rows at the given indices."""
+        return PaperBatch(
+            arxiv_ids=[self.arxiv_ids[i] for i in indices],
+            titles=[self.titles[i] for i in indices],
+            abstracts=[self.abstracts[i] for i in indices],
+            authors=[self.authors[i] for i in indices],
+            categories=[self.categories[i] for i in indices],
+            dates=self.dates[indices],
+            embeddings=self.embeddings[indices] if self.embeddings is not None else None,
+        )
+
+
+def _to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert a timezone-aware datetime to naive UTC for datetime64 storage."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class ArxivFetcher:
     """Fetches papers from arXiv API."""
     
@@ -59,6 +122,117 @@ class ArxivFetcher:
                 published_date=result.published,
             )
             
+    async def search_async(
+        self,
+        query: str,
+        max_results: int = 50,
+        sort_by: arxiv.SortCriterion = arxiv.SortCriterion.SubmittedDate,
+        sort_order: arxiv.SortOrder = arxiv.SortOrder.Descending,
+    ) -> AsyncGenerator[Paper, None]:
+        """
+        Search arXiv, fetching result pages concurrently.
+        
+        At most Config.ARXIV_MAX_CONCURRENCY pages are requested or waiting
+        to be consumed at once, and papers are yielded as soon as their page
+        arrives, so memory stays bounded however many results are requested.
+        Requests are spaced Config.ARXIV_DELAY_SECONDS apart, and rate-limited
+        or failed requests are retried with exponential backoff.
+        Results are not guaranteed to follow the requested sort order across
+        pages. arXiv sometimes returns short or empty pages, so those are
+        retried unless the feed's total result count shows the results are
+        exhausted, in which case no further pages are requested.
+        
+        Args:
+            query: Search query (supports arXiv query syntax)
+            max_results: Maximum number of results to return
+            sort_by: Sort criterion (Relevance, LastUpdatedDate, SubmittedDate)
+            sort_order: Sort order (Ascending, Descending)
+            
+        Yields:
+            Paper objects matching the search criteria
+        """
+        page_size = Config.ARXIV_PAGE_SIZE
+        starts = iter(range(0, max_results, page_size))
+        
+        # Shared by all page requests so the spacing holds across them
+        spacing = asyncio.Lock()
+        last_request = 0.0
+        
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            
+            async def get(params: dict) -> httpx.Response:
+                nonlocal last_request
+                for attempt in range(Config.ARXIV_NUM_RETRIES + 1):
+                    async with spacing:
+                        delay = last_request + Config.ARXIV_DELAY_SECONDS - time.monotonic()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        last_request = time.monotonic()
+                        
+                    try:
+                        response = await client.get(ARXIV_API_URL, params=params)
+                        response.raise_for_status()
+                        return response
+                    except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                        retryable = (
+                            not isinstance(e, httpx.HTTPStatusError)
+                            or e.response.status_code in RETRY_STATUS_CODES
+                        )
+                        if not retryable or attempt == Config.ARXIV_NUM_RETRIES:
+                            raise
+                    await asyncio.sleep(Config.ARXIV_DELAY_SECONDS * 2 ** attempt)
+                    
+            async def fetch_page(start: int) -> tuple[list[Paper], Optional[int]]:
+                params = {
+                    "search_query": query,
+                    "start": start,
+                    "max_results": min(page_size, max_results - start),
+                    "sortBy": sort_by.value,
+                    "sortOrder": sort_order.value,
+                }
+                for _ in range(Config.ARXIV_NUM_RETRIES + 1):
+                    feed = feedparser.parse((await get(params)).text)
+                    papers = [self._entry_to_paper(entry) for entry in feed.entries]
+                    total = feed.feed.get("opensearch_totalresults")
+                    total = int(total) if total is not None else None
+                    
+                    exhausted = total is not None and start + len(papers) >= total
+                    if len(papers) == params["max_results"] or exhausted:
+                        break
+                return papers, total
+                
+            pending = {
+                asyncio.create_task(fetch_page(start))
+                for start in itertools.islice(starts, Config.ARXIV_MAX_CONCURRENCY)
+            }
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        papers, total = task.result()
+                        for paper in papers:
+                            yield paper
+                            
+                        # Refill only once a page is consumed, and stop past the end of the results
+                        start = next(starts, None)
+                        if start is not None and (total is None or start < total):
+                            pending.add(asyncio.create_task(fetch_page(start)))
+            finally:
+                for task in pending:
+                    task.cancel()
+                    
+    @staticmethod
+    def _entry_to_paper(entry) -> Paper:
+        """Convert an Atom feed entry from the arXiv API into a Paper."""
+        return Paper(
+            arxiv_id=entry.id.split("/")[-1],
+            title=entry.title.replace("\n", " "),
+            abstract=entry.summary.replace("\n", " "),
+            authors=[author.name for author in entry.get("authors", [])],
+            categories=[tag["term"] for tag in entry.get("tags", [])],
+            published_date=datetime(*entry.published_parsed[:6], tzinfo=timezone.utc),
+        )
+        
     def fetch_by_category(
         self,
         category: str,
@@ -77,6 +251,25 @@ class ArxivFetcher:
         query = f"cat:{category}"
         yield from self.search(query, max_results)
         
+    async def fetch_by_category_async(
+        self,
+        category: str,
+        max_results: int = 50,
+    ) -> AsyncGenerator[Paper, None]:
+        """
+        Fetch papers from a specific arXiv category, fetching pages concurrently.
+        
+        Args:
+            category: arXiv category (e.g., 'cs.AI', 'cs.LG', 'physics.gen-ph')
+            max_results: Maximum number of results to return
+            
+        Yields:
+            Paper objects in the specified category
+        """
+        query = f"cat:{category}"
+        async for paper in self.search_async(query, max_results):
+            yield paper
+            
     def fetch_recent(
         self,
         categories: list[str] = None,
@@ -0,0 +1,64 @@
+"""In-process LRU cache with time-based expiry."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class QueryCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+    
+    def __init__(self, max_size: int = 2048, ttl: float = 300.0):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries before evicting the least recently used
+            ttl: Seconds an entry stays valid after it is stored
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+                
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+            
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            
+    def stats(self) -> dict:
+        """Get cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -16,17 +16,53 @@ class Config:
     POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
     
+    # Connection pool size (idle connections kept open, and the most in use at once)
+    POSTGRES_POOL_MIN = int(os.getenv("POSTGRES_POOL_MIN", "2"))
+    POSTGRES_POOL_MAX = int(os.getenv("POSTGRES_POOL_MAX", "20"))
+    
     # Ollama settings
     OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
     OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
     OLLAMA_LLM_MODEL = os.getenv("OLLAMA_LLM_MODEL", "llama3.2:3b")
     
-    # Vector dimension (nomic-embed-text produces 768-dim vectors)
+    # Stored vector dimension (nomic-embed-text produces 768-dim vectors;
+    # smaller values keep only the leading Matryoshka dimensions)
     EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "768"))
     
+    # HNSW graph parameters and query-time candidate list size
+    # (0 = chosen from the number of indexed papers when the index is built)
+    HNSW_M = int(os.getenv("HNSW_M", "0"))
+    HNSW_EFC = int(os.getenv("HNSW_EFC", "0"))
+    HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "0"))
+    
+    # Resources for building the HNSW index (empty/0 = server defaults); a
+    # parallel build needs HNSW_BUILD_MEMORY of shared memory on the server
+    HNSW_BUILD_MEMORY = os.getenv("HNSW_BUILD_MEMORY", "")
+    HNSW_BUILD_WORKERS = int(os.getenv("HNSW_BUILD_WORKERS", "0"))
+    
     # RAG settings
     TOP_K_RESULTS = int(os.getenv("TOP_K_RESULTS", "5"))
     
+    # Search result cache (cleared on every insert)
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+    QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "300"))
+    
+    # Query embedding cache (embeddings never go stale, so the TTL only bounds memory)
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+    EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", "3600"))
+    
+    # arXiv API paging; the API terms ask for one connection and a request
+    # every 3 seconds, so concurrency stays at 1 unless raised explicitly
+    ARXIV_PAGE_SIZE = int(os.getenv("ARXIV_PAGE_SIZE", "100"))
+    ARXIV_MAX_CONCURRENCY = int(os.getenv("ARXIV_MAX_CONCURRENCY", "1"))
+    ARXIV_DELAY_SECONDS = float(os.getenv("ARXIV_DELAY_SECONDS", "3"))
+    ARXIV_NUM_RETRIES = int(os.getenv("ARXIV_NUM_RETRIES", "3"))
+    
+    # Ingestion settings
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "64"))
+    EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+    
     @classmethod
     def get_postgres_uri(cls) -> str:
         """Get PostgreSQL connection URI."""
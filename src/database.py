@@ -1,58 +1,193 @@
-"""Database module for PostgreSQL with pgvector support."""
+"""
+Database module for PostgreSQL with pgvector support.
+
+Borrowing a connection registers VectorTextAdapter globally for np.ndarray,
+as pgvector's register_vector does for its own adapter, so every numpy array
+passed as a query parameter anywhere in the process is sent as a vector literal.
+"""
+
+import functools
+import hashlib
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
 
 import numpy as np
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import register_adapter
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from pgvector.psycopg2 import register_vector
-from typing import Optional
 
+from .arxiv_fetcher import PaperBatch
+from .cache import QueryCache
 from .config import Config
+from .pgcopy import COPY_HEADER, COPY_TRAILER, PAPER_COLUMNS, CopyStream, encode_rows
+
+
+# Smallest batch worth sending through COPY instead of execute_values
+COPY_MIN_ROWS = 32
+
+# Bytes copy_expert pulls from the encoder per read
+COPY_READ_SIZE = 1 << 16
+
+# HNSW parameters by table size, as (max papers, m, ef_construction, ef_search);
+# larger graphs need more links and wider searches to keep recall up. ef_search
+# is also the number of one-bit candidates re-ranked, which needs oversampling
+HNSW_PROFILES = (
+    (100_000, 16, 64, 200),
+    (1_000_000, 24, 100, 400),
+    (None, 32, 128, 800),
+)
+
+# ON CONFLICT action that refreshes existing papers in bulk loads
+UPSERT_ACTION = """DO UPDATE SET
+                    title = EXCLUDED.title,
+                    abstract = EXCLUDED.abstract,
+                    authors = EXCLUDED.authors,
+                    categories = EXCLUDED.categories,
+                    published_date = EXCLUDED.published_date,
+                    embedding = EXCLUDED.embedding"""
+
+# Hot-path queries prepared once per connection to skip parsing and planning
+PREPARED_STATEMENTS = {
+    "paper_exists_q": """
+        PREPARE paper_exists_q (varchar) AS
+        SELECT EXISTS(SELECT 1 FROM papers WHERE arxiv_id = $1)
+    """,
+    "insert_paper_q": """
+        PREPARE insert_paper_q (varchar, text, text, text[], text[], timestamp, halfvec) AS
+        INSERT INTO papers (arxiv_id, title, abstract, authors, categories, published_date, embedding)
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        ON CONFLICT (arxiv_id) DO NOTHING
+        RETURNING id
+    """,
+    "search_q": """
+        PREPARE search_q (halfvec, int, int) AS
+        WITH candidates AS (
+            SELECT id
+            FROM papers
+            ORDER BY embedding_bit <~> binary_quantize($1)
+            LIMIT $2
+        )
+        SELECT 
+            p.arxiv_id,
+            p.title,
+            p.abstract,
+            p.authors,
+            p.categories,
+            p.published_date,
+            -(p.embedding <#> $1) as similarity
+        FROM papers p
+        JOIN candidates c ON c.id = p.id
+        ORDER BY similarity DESC
+        LIMIT $3
+    """,
+}
 
 
 class Database:
     """PostgreSQL database handler with pgvector support."""
     
     def __init__(self):
-        self.conn: Optional[psycopg2.extensions.connection] = None
-        self._initialized = False
+        self.pool: Optional[ThreadedConnectionPool] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._extension_ready = False
+        self._registered: weakref.WeakSet = weakref.WeakSet()
+        self._prepared: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.cache = QueryCache(Config.QUERY_CACHE_SIZE, Config.QUERY_CACHE_TTL)
+        
+        # Default HNSW search breadth; init_schema sizes it to the table
+        self.ef_search = Config.HNSW_EF_SEARCH or HNSW_PROFILES[0][3]
         
     def connect(self) -> None:
-        """Establish database connection."""
+        """Create the database connection pool."""
+        if self.pool:
+            return
+            
         connect_kwargs = {
             "host": Config.POSTGRES_HOST,
             "port": Config.POSTGRES_PORT,
             "dbname": Config.POSTGRES_DB,
             "user": Config.POSTGRES_USER,
+            "application_name": "arxiv-rag",
+            # Detect dead peers on idle pooled connections instead of hanging
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "tcp_user_timeout": 30000,
         }
         if Config.POSTGRES_PASSWORD:
             connect_kwargs["password"] = Config.POSTGRES_PASSWORD
             
-        self.conn = psycopg2.connect(**connect_kwargs)
+        # psycopg2 keeps up to minconn idle connections open and raises once
+        # maxconn are in use, so callers wait on a slot instead of failing
+        self.pool = ThreadedConnectionPool(
+            minconn=Config.POSTGRES_POOL_MIN,
+            maxconn=Config.POSTGRES_POOL_MAX,
+            **connect_kwargs,
+        )
+        self._slots = threading.BoundedSemaphore(Config.POSTGRES_POOL_MAX)
         
-    def _ensure_ready(self) -> None:
-        """Ensure connection is established and vector extension is registered."""
-        if not self.conn:
+    @contextmanager
+    def _conn(self) -> Iterator[psycopg2.extensions.connection]:
+        """Borrow a pooled connection with the vector type registered."""
+        if not self.pool:
             self.connect()
-        if not self._initialized:
-            # Create extension and register vector type
-            with self.conn.cursor() as cur:
+            
+        pool = self.pool
+        with self._slots:
+            conn = pool.getconn()
+            broken = False
+            try:
+                if conn not in self._registered:
+                    self._register(conn)
+                yield conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            finally:
+                # Discard connections that failed at the connection level; the
+                # pool rolls back any transaction left open on healthy ones
+                pool.putconn(conn, close=broken or bool(conn.closed))
+            
+    def _register(self, conn: psycopg2.extensions.connection) -> None:
+        """Create the vector extension once and register its type on a connection."""
+        if not self._extension_ready:
+            with conn.cursor() as cur:
                 cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
-                self.conn.commit()
-            register_vector(self.conn)
-            self._initialized = True
+            conn.commit()
+            self._extension_ready = True
+            
+        register_vector(conn)
+        # register_vector installs its ndarray adapter globally each time, so
+        # reinstall ours after it (see VectorTextAdapter)
+        register_adapter(np.ndarray, VectorTextAdapter)
+        conn.commit()
+        self._registered.add(conn)
         
     def close(self) -> None:
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-            self._initialized = False
+        """Close all pooled database connections."""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+            self._registered = weakref.WeakSet()
+            self._prepared = weakref.WeakKeyDictionary()
+            
+    def _execute_prepared(self, conn, cur, name: str, params: tuple) -> None:
+        """Execute a server-side prepared statement, preparing it on this connection first."""
+        prepared = self._prepared.setdefault(conn, set())
+        if name not in prepared:
+            cur.execute(PREPARED_STATEMENTS[name])
+            prepared.add(name)
             
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXECUTE {name} ({placeholders})", params)
+        
     def init_schema(self) -> None:
         """Initialize database schema with pgvector extension."""
-        self._ensure_ready()
-        
-        with self.conn.cursor() as cur:
+        with self._conn() as conn, conn.cursor() as cur:
             # Create papers table
             cur.execute(f"""
                 CREATE TABLE IF NOT EXISTS papers (
@@ -63,30 +198,204 @@ class Database:
                     authors TEXT[],
                     categories TEXT[],
                     published_date TIMESTAMP,
-                    embedding vector({Config.EMBEDDING_DIM}),
+                    embedding halfvec({Config.EMBEDDING_DIM}) NOT NULL,
+                    embedding_bit bit({Config.EMBEDDING_DIM})
+                        GENERATED ALWAYS AS (binary_quantize(embedding)::bit({Config.EMBEDDING_DIM})) STORED,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
             
-            # Create index for vector similarity search (using HNSW for better performance)
-            cur.execute(f"""
-                CREATE INDEX IF NOT EXISTS papers_embedding_idx 
-                ON papers 
-                USING hnsw (embedding vector_cosine_ops)
+            # Only the one-bit codes are indexed; halfvec embeddings are read
+            # just to re-rank the candidates, so they need no index of their own.
+            # Drop the old indexes before migrating the column, since changing
+            # its type would rebuild them with opclasses that reject halfvec
+            cur.execute("DROP INDEX IF EXISTS papers_embedding_idx")
+            cur.execute("DROP INDEX IF EXISTS papers_embedding_q_idx")
+            cur.execute("DROP INDEX IF EXISTS papers_embedding_q_ip_idx")
+            cur.execute("DROP INDEX IF EXISTS papers_embedding_ip_idx")
+            
+            # Migrate tables that stored full-precision embeddings alongside
+            # a generated half-precision copy to a single halfvec column
+            cur.execute("""
+                SELECT format_type(atttypid, atttypmod), attnotnull
+                FROM pg_attribute
+                WHERE attrelid = 'papers'::regclass AND attname = 'embedding'
+            """)
+            embedding_type, embedding_not_null = cur.fetchone()
+            
+            # CREATE TABLE IF NOT EXISTS keeps the stored width, and every
+            # insert and search would fail on a different EMBEDDING_DIM
+            stored_dim = int(embedding_type[embedding_type.index("(") + 1:-1])
+            if stored_dim != Config.EMBEDDING_DIM:
+                raise RuntimeError(
+                    f"papers.embedding stores {stored_dim}-dim vectors but EMBEDDING_DIM is "
+                    f"{Config.EMBEDDING_DIM}; re-ingest into a fresh papers table to change it"
+                )
+                
+            if embedding_type.startswith("vector"):
+                cur.execute("ALTER TABLE papers DROP COLUMN IF EXISTS embedding_q")
+                cur.execute(f"""
+                    ALTER TABLE papers ALTER COLUMN embedding
+                    TYPE halfvec({Config.EMBEDDING_DIM})
+                    USING embedding::halfvec({Config.EMBEDDING_DIM})
+                """)
+                
+            # Searches skip the IS NOT NULL filter, so the column must forbid
+            # NULLs; rows without an embedding were never searchable anyway
+            if not embedding_not_null:
+                cur.execute("DELETE FROM papers WHERE embedding IS NULL")
+                cur.execute("ALTER TABLE papers ALTER COLUMN embedding SET NOT NULL")
+                
+            # Upgrade tables created before the binary-quantized column existed.
+            # ALTER TABLE locks the table before checking IF NOT EXISTS, so
+            # look the column up first rather than queueing behind a rebuild
+            cur.execute("""
+                SELECT 1
+                FROM pg_attribute
+                WHERE attrelid = 'papers'::regclass
+                    AND attname = 'embedding_bit'
+                    AND NOT attisdropped
             """)
+            if cur.fetchone() is None:
+                cur.execute(f"""
+                    ALTER TABLE papers ADD COLUMN
+                    embedding_bit bit({Config.EMBEDDING_DIM})
+                        GENERATED ALWAYS AS (binary_quantize(embedding)::bit({Config.EMBEDDING_DIM})) STORED
+                """)
+            
+            # Lets get_all_papers read the newest papers in index order; CREATE
+            # INDEX locks the table even when the index exists, so check first
+            cur.execute("SELECT to_regclass('papers_published_date_idx') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                cur.execute("""
+                    CREATE INDEX papers_published_date_idx
+                    ON papers (published_date DESC)
+                """)
+            
+            # Graph parameters are chosen only when the index is first built;
+            # rebuilding it for a grown table is an explicit build_index call
+            cur.execute("SELECT to_regclass('papers_embedding_bit_idx') IS NOT NULL")
+            index_exists = cur.fetchone()[0]
+            self.ef_search = self._hnsw_params(cur)[2]
+            
+            conn.commit()
             
-            self.conn.commit()
+        if not index_exists:
+            self.build_index()
+            
+    def _hnsw_params(self, cur) -> tuple[int, int, int]:
+        """Size (m, ef_construction, ef_search) for the current table unless configured explicitly."""
+        cur.execute("SELECT COUNT(*) FROM papers")
+        m, ef_construction, ef_search = hnsw_profile(cur.fetchone()[0])
+        return (
+            Config.HNSW_M or m,
+            Config.HNSW_EFC or ef_construction,
+            Config.HNSW_EF_SEARCH or ef_search,
+        )
+        
+    def build_index(self, concurrently: bool = False) -> None:
+        """
+        Build the HNSW index over the binary-quantized embeddings.
+        
+        Graph parameters are sized for the current table, and nothing is done
+        if a valid index with those parameters exists. Call this after the
+        table has grown to rebuild a smaller graph; a concurrent build does not
+        block inserts, and the outdated index keeps serving searches until its
+        replacement is ready.
+        
+        Args:
+            concurrently: Use CREATE INDEX CONCURRENTLY, which runs outside a transaction
+        """
+        with self._conn() as conn:
+            conn.autocommit = concurrently
+            try:
+                with conn.cursor() as cur:
+                    m, ef_construction, self.ef_search = self._hnsw_params(cur)
+                    
+                    cur.execute("""
+                        SELECT c.reloptions, i.indisvalid
+                        FROM pg_class c
+                        JOIN pg_index i ON i.indexrelid = c.oid
+                        WHERE c.relname = 'papers_embedding_bit_idx'
+                    """)
+                    row = cur.fetchone()
+                    options = {f"m={m}", f"ef_construction={ef_construction}"}
+                    if row is not None and row[1] and set(row[0] or []) == options:
+                        return
+                        
+                    # Optionally give the build more memory and workers; a plain
+                    # build scopes both to its transaction, a concurrent one
+                    # resets them afterwards
+                    scope = "SESSION" if concurrently else "LOCAL"
+                    if Config.HNSW_BUILD_MEMORY:
+                        cur.execute(
+                            f"SET {scope} maintenance_work_mem = %s",
+                            (Config.HNSW_BUILD_MEMORY,)
+                        )
+                    if Config.HNSW_BUILD_WORKERS:
+                        cur.execute(
+                            f"SET {scope} max_parallel_maintenance_workers = %s",
+                            (Config.HNSW_BUILD_WORKERS,)
+                        )
+                    
+                    if concurrently:
+                        # Build the replacement under another name; a failed
+                        # concurrent build leaves an invalid index behind
+                        name = "papers_embedding_bit_idx_new"
+                        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                    else:
+                        name = "papers_embedding_bit_idx"
+                        cur.execute(f"DROP INDEX IF EXISTS {name}")
+                        
+                    cur.execute(
+                        f"""
+                        CREATE INDEX {"CONCURRENTLY " if concurrently else ""}{name}
+                        ON papers 
+                        USING hnsw (embedding_bit bit_hamming_ops)
+                        WITH (m = %s, ef_construction = %s)
+                        """,
+                        (m, ef_construction)
+                    )
+                    
+                    if concurrently:
+                        # Statements sent together run as one implicit
+                        # transaction, so searches never see the index missing
+                        cur.execute("""
+                            DROP INDEX IF EXISTS papers_embedding_bit_idx;
+                            ALTER INDEX papers_embedding_bit_idx_new
+                                RENAME TO papers_embedding_bit_idx
+                        """)
+                    else:
+                        conn.commit()
+            finally:
+                if concurrently and not conn.closed:
+                    with conn.cursor() as cur:
+                        cur.execute("RESET maintenance_work_mem; RESET max_parallel_maintenance_workers")
+                    conn.autocommit = False
+                    
+    def drop_index(self) -> None:
+        """Drop the HNSW index, e.g. before a bulk load; searches scan the table until it is rebuilt."""
+        with self._conn() as conn, conn.cursor() as cur:
+            cur.execute("DROP INDEX IF EXISTS papers_embedding_bit_idx")
+            conn.commit()
             
     def paper_exists(self, arxiv_id: str) -> bool:
         """Check if a paper already exists in the database."""
-        self._ensure_ready()
+        with self._conn() as conn, conn.cursor() as cur:
+            self._execute_prepared(conn, cur, "paper_exists_q", (arxiv_id,))
+            return cur.fetchone()[0]
+            
+    def existing_ids(self, arxiv_ids: list[str]) -> set[str]:
+        """Return which of the given arXiv IDs are already in the database."""
+        if not arxiv_ids:
+            return set()
             
-        with self.conn.cursor() as cur:
+        with self._conn() as conn, conn.cursor() as cur:
             cur.execute(
-                "SELECT EXISTS(SELECT 1 FROM papers WHERE arxiv_id = %s)",
-                (arxiv_id,)
+                "SELECT arxiv_id FROM papers WHERE arxiv_id = ANY(%s)",
+                (list(arxiv_ids),)
             )
-            return cur.fetchone()[0]
+            return {row[0] for row in cur.fetchall()}
             
     def insert_paper(
         self,
@@ -96,86 +405,352 @@ class Database:
         authors: list[str],
         categories: list[str],
         published_date,
-        embedding: list[float],
-    ) -> int:
-        """Insert a new paper with its embedding."""
-        self._ensure_ready()
-        
-        # Convert to numpy array for pgvector compatibility
-        embedding_vector = np.array(embedding, dtype=np.float32)
+        embedding: np.ndarray,
+    ) -> Optional[int]:
+        """Insert a new paper with its embedding; returns None if it already existed."""
+        with self._conn() as conn, conn.cursor() as cur:
+            self._execute_prepared(
+                conn,
+                cur,
+                "insert_paper_q",
+                (arxiv_id, title, abstract, authors, categories, published_date,
+                 np.asarray(embedding, dtype=np.float32)),
+            )
+            row = cur.fetchone()
+            conn.commit()
             
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
+        if row is None:
+            return None
+            
+        self.cache.clear()
+        return row[0]
+        
+    def bulk_insert_papers(self, batch: PaperBatch, update: bool = True) -> dict[str, int]:
+        """
+        Insert many papers with their embeddings in a single transaction.
+        
+        Args:
+            batch: Papers with their embeddings filled in
+            update: Overwrite papers that already exist instead of skipping them
+                
+        Returns:
+            Database id of each inserted (or, with update, updated) paper, keyed by arXiv ID
+        """
+        batch = _dedupe(batch)
+        embeddings = np.asarray(batch.embeddings, dtype=np.float32)
+        values = zip(
+            batch.arxiv_ids,
+            batch.titles,
+            batch.abstracts,
+            batch.authors,
+            batch.categories,
+            batch.dates.tolist(),
+            embeddings,
+        )
+        
+        with self._conn() as conn, conn.cursor() as cur:
+            results = execute_values(
+                cur,
+                f"""
                 INSERT INTO papers (arxiv_id, title, abstract, authors, categories, published_date, embedding)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (arxiv_id) DO UPDATE SET
-                    title = EXCLUDED.title,
-                    abstract = EXCLUDED.abstract,
-                    authors = EXCLUDED.authors,
-                    categories = EXCLUDED.categories,
-                    published_date = EXCLUDED.published_date,
-                    embedding = EXCLUDED.embedding
-                RETURNING id
+                VALUES %s
+                ON CONFLICT (arxiv_id) {UPSERT_ACTION if update else "DO NOTHING"}
+                RETURNING arxiv_id, id
                 """,
-                (arxiv_id, title, abstract, authors, categories, published_date, embedding_vector)
+                values,
+                template="(%s, %s, %s, %s, %s, %s, %s)",
+                page_size=200,
+                fetch=True,
             )
-            paper_id = cur.fetchone()[0]
-            self.conn.commit()
-            return paper_id
+            conn.commit()
+            
+        # Cached search results may now be missing these papers
+        self.cache.clear()
+        return dict(results)
             
-    def search_similar(self, query_embedding: list[float], top_k: int = 5) -> list[dict]:
-        """Search for papers similar to the query embedding using cosine similarity."""
-        self._ensure_ready()
+    def copy_insert(self, batch: PaperBatch, update: bool = True) -> dict[str, int]:
+        """
+        Insert many papers through a binary COPY, for large ingests.
         
-        # Convert to numpy array for pgvector compatibility
-        embedding_vector = np.array(query_embedding, dtype=np.float32)
+        Batches smaller than COPY_MIN_ROWS fall back to bulk_insert_papers,
+        where COPY's setup cost outweighs its per-row savings.
+        
+        Args:
+            batch: Papers with their embeddings filled in
+            update: Overwrite papers that already exist instead of skipping them
             
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        Returns:
+            Database id of each inserted (or, with update, updated) paper, keyed by arXiv ID
+        """
+        if len(batch) < COPY_MIN_ROWS:
+            return self.bulk_insert_papers(batch, update)
+        return self.copy_papers([batch], update)
+        
+    def copy_papers(self, batches: Iterable[PaperBatch], update: bool = True) -> dict[str, int]:
+        """
+        Load any number of batches with a single streamed binary COPY.
+        
+        Batches are encoded only as COPY reads them, so a backfill holds one
+        batch of rows in memory at a time. Rows land in a temporary staging
+        table and are then upserted, so existing papers are updated just like
+        in bulk_insert_papers unless update is False; if an arXiv ID repeats,
+        its last row wins.
+        
+        Args:
+            batches: Papers with their embeddings filled in, e.g. a generator
+            update: Overwrite papers that already exist instead of skipping them
+            
+        Returns:
+            Database id of each inserted (or, with update, updated) paper, keyed by arXiv ID
+        """
+        def chunks() -> Iterator[bytes]:
+            yield COPY_HEADER
+            for batch in batches:
+                yield encode_rows(batch, batch.embeddings)
+            yield COPY_TRAILER
+            
+        columns = ", ".join(PAPER_COLUMNS)
+        
+        with self._conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TEMP TABLE papers_stage (
+                    arxiv_id VARCHAR(50),
+                    title TEXT,
+                    abstract TEXT,
+                    authors TEXT[],
+                    categories TEXT[],
+                    published_date TIMESTAMP,
+                    embedding halfvec({Config.EMBEDDING_DIM})
+                ) ON COMMIT DROP
+            """)
+            cur.copy_expert(
+                f"COPY papers_stage ({columns}) FROM STDIN WITH (FORMAT BINARY)",
+                CopyStream(chunks()),
+                size=COPY_READ_SIZE,
+            )
+            # ON CONFLICT cannot touch a row twice per statement, so keep the
+            # last copy of each arXiv ID (staging rows are in COPY order)
+            cur.execute(f"""
+                INSERT INTO papers ({columns})
+                SELECT DISTINCT ON (arxiv_id) {columns}
+                FROM papers_stage
+                ORDER BY arxiv_id, ctid DESC
+                ON CONFLICT (arxiv_id) {UPSERT_ACTION if update else "DO NOTHING"}
+                RETURNING arxiv_id, id
+            """)
+            results = cur.fetchall()
+            conn.commit()
+            
+        self.cache.clear()
+        return dict(results)
+        
+    def bulk_load(self, batches: Iterable[PaperBatch]) -> dict[str, int]:
+        """
+        Backfill many batches with the HNSW index built once at the end.
+        
+        Each row inserted into an existing HNSW graph pays for a graph search,
+        so large loads are much faster when the index is dropped first and
+        rebuilt afterwards. Searches are slow in the meantime. If the load
+        fails, the index stays dropped until build_index or init_schema runs.
+        
+        Args:
+            batches: Papers with their embeddings filled in, e.g. a generator
+            
+        Returns:
+            Database id of each inserted or updated paper, keyed by arXiv ID
+        """
+        self.drop_index()
+        results = self.copy_papers(batches)
+        self.build_index()
+        return results
+            
+    def search_similar(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        ef_search: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Search for papers similar to the query embedding using cosine similarity.
+        
+        Candidates are found by Hamming distance on the HNSW index over
+        one-bit quantized embeddings, which reads dim/8 bytes per probe, and
+        then re-ranked by exact distance on the halfvec embeddings. Vectors
+        are unit length (the embedder normalizes them), so negative inner
+        product orders like cosine distance.
+        
+        Args:
+            query_embedding: Unit-length query embedding vector
+            top_k: Number of results to return
+            ef_search: HNSW candidates fetched and re-ranked; higher trades latency for recall
+            
+        Returns:
+            List of paper dictionaries with a similarity score
+        """
+        embedding_vector = np.asarray(query_embedding, dtype=np.float32)
+        
+        # An HNSW scan returns at most ef_search rows, so every candidate it
+        # returns is re-ranked (pgvector caps ef_search at 1000)
+        ef_search = min(max(ef_search or self.ef_search, top_k), 1000)
+        
+        cache_key = (
+            hashlib.blake2b(embedding_vector.tobytes(), digest_size=16).digest()
+            + top_k.to_bytes(2, "little")
+            + ef_search.to_bytes(2, "little")
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+            
+        with self._conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # SET LOCAL only lasts for this transaction, which the pool ends on return
+            cur.execute("SET LOCAL hnsw.ef_search = %s", (ef_search,))
+            self._execute_prepared(
+                conn, cur, "search_q", (embedding_vector, ef_search, top_k)
+            )
+            results = [dict(row) for row in cur.fetchall()]
+            
+        self.cache.set(cache_key, results)
+        return results
+            
+    def search_similar_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 5,
+        ef_search: Optional[int] = None,
+    ) -> list[list[dict]]:
+        """
+        Search for papers similar to several query embeddings in one round trip.
+        
+        Args:
+            query_embeddings: Query embedding vectors
+            top_k: Number of results to return per query
+            ef_search: HNSW candidates fetched and re-ranked; higher trades latency for recall
+            
+        Returns:
+            One list of paper dictionaries per query, in input order
+        """
+        if len(query_embeddings) == 0:
+            return []
+            
+        embedding_vectors = list(np.asarray(query_embeddings, dtype=np.float32))
+        ef_search = min(max(ef_search or self.ef_search, top_k), 1000)
+        
+        with self._conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SET LOCAL hnsw.ef_search = %s", (ef_search,))
             cur.execute(
                 """
-                SELECT 
-                    arxiv_id,
-                    title,
-                    abstract,
-                    authors,
-                    categories,
-                    published_date,
-                    1 - (embedding <=> %s) as similarity
-                FROM papers
-                WHERE embedding IS NOT NULL
-                ORDER BY embedding <=> %s
-                LIMIT %s
+                SELECT
+                    q.idx,
+                    p.arxiv_id,
+                    p.title,
+                    p.abstract,
+                    p.authors,
+                    p.categories,
+                    p.published_date,
+                    p.similarity
+                FROM unnest(%(queries)s::halfvec[]) WITH ORDINALITY AS q(v, idx)
+                CROSS JOIN LATERAL (
+                    SELECT
+                        r.arxiv_id,
+                        r.title,
+                        r.abstract,
+                        r.authors,
+                        r.categories,
+                        r.published_date,
+                        -(r.embedding <#> q.v) as similarity
+                    FROM papers r
+                    WHERE r.id IN (
+                        SELECT id
+                        FROM papers
+                        ORDER BY embedding_bit <~> binary_quantize(q.v)
+                        LIMIT %(candidates)s
+                    )
+                    ORDER BY similarity DESC
+                    LIMIT %(top_k)s
+                ) p
+                ORDER BY q.idx, p.similarity DESC
                 """,
-                (embedding_vector, embedding_vector, top_k)
+                {"queries": embedding_vectors, "candidates": ef_search, "top_k": top_k}
             )
-            return [dict(row) for row in cur.fetchall()]
+            
+            results = [[] for _ in embedding_vectors]
+            for row in cur.fetchall():
+                row = dict(row)
+                results[row.pop("idx") - 1].append(row)
+            return results
             
     def get_paper_count(self) -> int:
         """Get the total number of papers in the database."""
-        self._ensure_ready()
-            
-        with self.conn.cursor() as cur:
+        with self._conn() as conn, conn.cursor() as cur:
             cur.execute("SELECT COUNT(*) FROM papers")
             return cur.fetchone()[0]
             
-    def get_all_papers(self, limit: int = 100, offset: int = 0) -> list[dict]:
-        """Get all papers with pagination."""
-        self._ensure_ready()
-            
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+    def get_all_papers(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        preview_chars: int = 300,
+    ) -> list[dict]:
+        """Get all papers with pagination, truncating abstracts to abstract_preview server-side."""
+        with self._conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(
                 """
-                SELECT arxiv_id, title, abstract, authors, categories, published_date
+                SELECT 
+                    arxiv_id,
+                    title,
+                    left(abstract, %s) AS abstract_preview,
+                    authors,
+                    categories,
+                    published_date
                 FROM papers
                 ORDER BY published_date DESC
                 LIMIT %s OFFSET %s
                 """,
-                (limit, offset)
+                (preview_chars, limit, offset)
             )
             return [dict(row) for row in cur.fetchall()]
 
 
+@functools.lru_cache(maxsize=8)
+def _vector_literal_format(dim: int) -> str:
+    """Build the %-format string for a quoted vector literal of dim values."""
+    return "'[" + ",".join(["%.6g"] * dim) + "]'"
+
+
+class VectorTextAdapter:
+    """
+    Adapt numpy arrays to compact vector literals.
+    
+    Values are rounded to float16 first, the same conversion the binary COPY
+    path applies, and six significant digits round-trip every float16 value
+    exactly, so literals are half the size of pgvector's repr() formatting
+    and one %-format call builds them several times faster.
+    """
+    
+    def __init__(self, value: np.ndarray):
+        self.value = value
+        
+    def getquoted(self) -> bytes:
+        values = self.value.astype(np.float16).tolist()
+        return (_vector_literal_format(len(values)) % tuple(values)).encode("ascii")
+
+
+def hnsw_profile(paper_count: int) -> tuple[int, int, int]:
+    """Pick (m, ef_construction, ef_search) for a table with paper_count rows."""
+    for max_papers, m, ef_construction, ef_search in HNSW_PROFILES:
+        if max_papers is None or paper_count <= max_papers:
+            return m, ef_construction, ef_search
+
+
+def _dedupe(batch: PaperBatch) -> PaperBatch:
+    """Keep the last row per arxiv_id, since ON CONFLICT cannot touch a row twice per statement."""
+    last_index = {arxiv_id: i for i, arxiv_id in enumerate(batch.arxiv_ids)}
+    if len(last_index) < len(batch):
+        batch = batch.take(list(last_index.values()))
+    return batch
+
+
 # Singleton instance
 db = Database()
 
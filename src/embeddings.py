@@ -1,9 +1,11 @@
 """Embeddings module using Ollama for vector generation."""
 
+import numpy as np
 import ollama
 from typing import Union
 
 from .config import Config
+from .ollama_shared import ollama_client
 
 
 class EmbeddingGenerator:
@@ -17,7 +19,7 @@ class EmbeddingGenerator:
             model: Ollama model name for embeddings (default: nomic-embed-text)
         """
         self.model = model or Config.OLLAMA_EMBED_MODEL
-        self.client = ollama.Client(host=Config.OLLAMA_HOST)
+        self.client = ollama_client
         
     def ensure_model(self) -> bool:
         """
@@ -41,7 +43,7 @@ class EmbeddingGenerator:
                 print(f"Failed to pull model {self.model}: {e}")
                 return False
                 
-    def generate(self, text: str) -> list[float]:
+    def generate(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
         
@@ -49,25 +51,35 @@ class EmbeddingGenerator:
             text: Text to embed
             
         Returns:
-            List of floats representing the embedding vector
+            Unit-length float32 array representing the embedding vector
         """
         response = self.client.embed(model=self.model, input=text)
-        return response["embeddings"][0]
+        return _l2_normalize(_truncate(np.asarray(response["embeddings"][0], dtype=np.float32)))
         
-    def generate_batch(self, texts: list[str]) -> list[list[float]]:
+    def generate_batch(self, texts: list[str], batch_size: int = None) -> np.ndarray:
         """
-        Generate embeddings for multiple texts.
+        Generate embeddings for multiple texts, one request per chunk.
         
         Args:
             texts: List of texts to embed
+            batch_size: Texts per request (default: Config.EMBED_BATCH_SIZE)
             
         Returns:
-            List of embedding vectors
+            Unit-length float32 array of shape (len(texts), dim), one row per text
         """
-        response = self.client.embed(model=self.model, input=texts)
-        return response["embeddings"]
+        batch_size = batch_size or Config.EMBED_BATCH_SIZE
+        chunks = [
+            np.asarray(
+                self.client.embed(model=self.model, input=texts[i:i + batch_size])["embeddings"],
+                dtype=np.float32,
+            )
+            for i in range(0, len(texts), batch_size)
+        ]
+        if not chunks:
+            return np.empty((0, Config.EMBEDDING_DIM), dtype=np.float32)
+        return _l2_normalize(_truncate(chunks[0] if len(chunks) == 1 else np.concatenate(chunks)))
         
-    def generate_for_paper(self, title: str, abstract: str) -> list[float]:
+    def generate_for_paper(self, title: str, abstract: str) -> np.ndarray:
         """
         Generate embedding for a paper by combining title and abstract.
         
@@ -78,8 +90,49 @@ class EmbeddingGenerator:
         Returns:
             Embedding vector for the combined text
         """
-        combined_text = f"Title: {title}\n\nAbstract: {abstract}"
-        return self.generate(combined_text)
+        return self.generate(self._paper_text(title, abstract))
+        
+    def generate_for_papers(self, papers: list[tuple[str, str]]) -> np.ndarray:
+        """
+        Generate embeddings for multiple papers in batched requests.
+        
+        Args:
+            papers: List of (title, abstract) pairs
+            
+        Returns:
+            Unit-length float32 array with one embedding row per paper
+        """
+        return self.generate_batch(
+            [self._paper_text(title, abstract) for title, abstract in papers]
+        )
+        
+    @staticmethod
+    def _paper_text(title: str, abstract: str) -> str:
+        """Combine a paper's title and abstract into the text that gets embedded."""
+        return f"Title: {title}\n\nAbstract: {abstract}"
+
+
+def _truncate(vectors: np.ndarray) -> np.ndarray:
+    """Keep the leading EMBEDDING_DIM dimensions of Matryoshka embeddings."""
+    if vectors.shape[-1] < Config.EMBEDDING_DIM:
+        raise ValueError(
+            f"Embedding model returned {vectors.shape[-1]}-dim vectors, "
+            f"fewer than EMBEDDING_DIM={Config.EMBEDDING_DIM}"
+        )
+    if vectors.shape[-1] == Config.EMBEDDING_DIM:
+        return vectors
+    # Copy so the full-width response buffer is not kept alive by a view
+    return np.ascontiguousarray(vectors[..., :Config.EMBEDDING_DIM])
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale float32 vectors to unit length in place, so inner product equals cosine similarity."""
+    # einsum avoids the squared temporary of np.linalg.norm, and the
+    # in-place division allocates nothing
+    norms = np.sqrt(np.einsum("...i,...i->...", vectors, vectors))[..., np.newaxis]
+    norms += 1e-12
+    vectors /= norms
+    return vectors
 
 
 # Singleton instance
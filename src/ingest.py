@@ -1,8 +1,10 @@
 """Paper ingestion module for fetching and indexing arXiv papers."""
 
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, Optional
 
-from .arxiv_fetcher import ArxivFetcher, Paper, POPULAR_CATEGORIES
+from .arxiv_fetcher import ArxivFetcher, Paper, PaperBatch, POPULAR_CATEGORIES
+from .config import Config
 from .embeddings import embedder
 from .database import db
 
@@ -30,8 +32,8 @@ class PaperIngestor:
         # Generate embedding
         embedding = embedder.generate_for_paper(paper.title, paper.abstract)
         
-        # Insert into database
-        db.insert_paper(
+        # Insert into database; None means another writer inserted it meanwhile
+        paper_id = db.insert_paper(
             arxiv_id=paper.arxiv_id,
             title=paper.title,
             abstract=paper.abstract,
@@ -41,43 +43,137 @@ class PaperIngestor:
             embedding=embedding,
         )
         
-        return True
+        return paper_id is not None
         
-    def ingest_from_search(
+    async def _ingest_papers(
         self,
-        query: str,
-        max_papers: int = 50,
+        papers: AsyncIterator[Paper],
+        total: int,
         progress_callback: Optional[callable] = None,
     ) -> dict:
         """
-        Ingest papers from an arXiv search query.
+        Ingest papers in batches as they arrive, skipping those already in the database.
+        
+        Runs as a three-stage pipeline connected by bounded queues: the fetch
+        loop groups papers into batches, INGEST_WORKERS workers drop papers
+        already in the database (one query per batch) and embed the rest, and
+        a single consumer inserts embedded batches. Fetching, embedding and
+        inserting overlap, so the total time approaches that of the slowest
+        stage rather than their sum. If any stage fails, the others are
+        cancelled and its exception is raised.
         
         Args:
-            query: Search query
-            max_papers: Maximum papers to fetch
+            papers: Async stream of papers to ingest
+            total: Expected number of papers, used for progress reporting
             progress_callback: Optional callback(current, total, paper_title)
             
         Returns:
             Dict with ingestion statistics
         """
         stats = {"fetched": 0, "ingested": 0, "skipped": 0}
+        workers = Config.INGEST_WORKERS
         
-        papers = list(self.fetcher.search(query, max_papers))
-        total = len(papers)
+        # Batches waiting to be embedded, and embedded batches waiting to be inserted
+        to_embed: asyncio.Queue = asyncio.Queue(maxsize=workers)
+        to_insert: asyncio.Queue = asyncio.Queue(maxsize=workers)
         
-        for i, paper in enumerate(papers):
-            stats["fetched"] += 1
-            
-            if progress_callback:
-                progress_callback(i + 1, total, paper.title)
+        async def produce() -> None:
+            batch = []
+            seen = set()
+            async for paper in papers:
+                stats["fetched"] += 1
                 
-            if self.ingest_paper(paper):
-                stats["ingested"] += 1
-            else:
-                stats["skipped"] += 1
+                if progress_callback:
+                    progress_callback(stats["fetched"], total, paper.title)
+                    
+                # arXiv can return a paper on more than one page; embed it once
+                if paper.arxiv_id in seen:
+                    stats["skipped"] += 1
+                    continue
+                seen.add(paper.arxiv_id)
+                    
+                batch.append(paper)
+                if len(batch) >= Config.INGEST_BATCH_SIZE:
+                    await to_embed.put(batch)
+                    batch = []
+                    
+            if batch:
+                await to_embed.put(batch)
+            for _ in range(workers):
+                await to_embed.put(None)
                 
+        async def embed() -> None:
+            while (batch := await to_embed.get()) is not None:
+                existing = await asyncio.to_thread(
+                    db.existing_ids, [paper.arxiv_id for paper in batch]
+                )
+                new_papers = [paper for paper in batch if paper.arxiv_id not in existing]
+                stats["skipped"] += len(batch) - len(new_papers)
+                if new_papers:
+                    await to_insert.put(await asyncio.to_thread(self._embed_batch, new_papers))
+            await to_insert.put(None)
+            
+        async def insert() -> None:
+            # Each embed worker sends its own end marker
+            for _ in range(workers):
+                while (batch := await to_insert.get()) is not None:
+                    inserted, attempted = await asyncio.to_thread(self._insert_batch, batch)
+                    stats["ingested"] += inserted
+                    stats["skipped"] += attempted - inserted
+                    
+        # A failing stage cancels the others, which would otherwise block
+        # forever on its full or empty queue
+        try:
+            async with asyncio.TaskGroup() as stages:
+                stages.create_task(produce())
+                for _ in range(workers):
+                    stages.create_task(embed())
+                stages.create_task(insert())
+        except ExceptionGroup as group:
+            raise group.exceptions[0]
+            
         return stats
         
+    def _embed_batch(self, papers: list[Paper]) -> PaperBatch:
+        """Embed a batch of papers into a column-oriented batch."""
+        batch = PaperBatch.from_papers(papers)
+        batch.embeddings = embedder.generate_for_papers(
+            list(zip(batch.titles, batch.abstracts))
+        )
+        return batch
+        
+    def _insert_batch(self, batch: PaperBatch) -> tuple[int, int]:
+        """
+        Insert the new papers of an embedded batch in one transaction.
+        
+        Papers another worker or writer inserted since the existence check
+        are left untouched and not counted.
+        
+        Returns:
+            Tuple of (newly inserted, attempted) paper counts
+        """
+        return len(db.copy_insert(batch, update=False)), len(batch)
+        
+    def ingest_from_search(
+        self,
+        query: str,
+        max_papers: int = 50,
+        progress_callback: Optional[callable] = None,
+    ) -> dict:
+        """
+        Ingest papers from an arXiv search query.
+        
+        Args:
+            query: Search query
+            max_papers: Maximum papers to fetch
+            progress_callback: Optional callback(current, total, paper_title)
+            
+        Returns:
+            Dict with ingestion statistics
+        """
+        papers = self.fetcher.search_async(query, max_papers)
+        return asyncio.run(self._ingest_papers(papers, max_papers, progress_callback))
+        
     def ingest_from_category(
         self,
         category: str,
@@ -95,23 +191,8 @@ class PaperIngestor:
         Returns:
             Dict with ingestion statistics
         """
-        stats = {"fetched": 0, "ingested": 0, "skipped": 0}
-        
-        papers = list(self.fetcher.fetch_by_category(category, max_papers))
-        total = len(papers)
-        
-        for i, paper in enumerate(papers):
-            stats["fetched"] += 1
-            
-            if progress_callback:
-                progress_callback(i + 1, total, paper.title)
-                
-            if self.ingest_paper(paper):
-                stats["ingested"] += 1
-            else:
-                stats["skipped"] += 1
-                
-        return stats
+        papers = self.fetcher.fetch_by_category_async(category, max_papers)
+        return asyncio.run(self._ingest_papers(papers, max_papers, progress_callback))
 
 
 # Singleton instance
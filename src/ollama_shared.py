@@ -0,0 +1,14 @@
+"""Shared Ollama client used by the embedder and the RAG pipeline."""
+
+import httpx
+import ollama
+
+from .config import Config
+
+
+# One client means one HTTP connection pool, so embedding and generation
+# requests reuse kept-alive sockets instead of each class opening its own
+ollama_client = ollama.Client(
+    host=Config.OLLAMA_HOST,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+)
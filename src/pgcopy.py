@@ -0,0 +1,127 @@
+"""Encoder for PostgreSQL binary COPY streams of paper rows."""
+
+import struct
+from typing import Iterable
+
+import numpy as np
+
+from .arxiv_fetcher import PaperBatch
+
+
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+COPY_TRAILER = struct.pack("!h", -1)
+NULL_FIELD = struct.pack("!i", -1)
+
+# Binary timestamps count microseconds from the PostgreSQL epoch
+PG_EPOCH = np.datetime64("2000-01-01T00:00:00", "us")
+TEXT_OID = 25
+
+# Element type of the halfvec embedding column
+VECTOR_DTYPE = ">f2"
+
+# Column order of every encoded row
+PAPER_COLUMNS = (
+    "arxiv_id",
+    "title",
+    "abstract",
+    "authors",
+    "categories",
+    "published_date",
+    "embedding",
+)
+
+
+def _write_text(buf: bytearray, value: str) -> None:
+    """Append a length-prefixed UTF-8 text field."""
+    data = value.encode("utf-8")
+    buf += struct.pack("!i", len(data))
+    buf += data
+
+
+def _write_text_array(buf: bytearray, values: list[str]) -> None:
+    """Append a one-dimensional text[] field (or NULL)."""
+    if values is None:
+        buf += NULL_FIELD
+        return
+        
+    items = [value.encode("utf-8") for value in values]
+    if not items:
+        body = struct.pack("!iii", 0, 0, TEXT_OID)
+    else:
+        body = struct.pack("!iiiii", 1, 0, TEXT_OID, len(items), 1) + b"".join(
+            struct.pack("!i", len(item)) + item for item in items
+        )
+    buf += struct.pack("!i", len(body))
+    buf += body
+
+
+def encode_rows(batch: PaperBatch, embeddings: np.ndarray) -> bytes:
+    """
+    Encode a batch of papers as binary COPY rows, without header or trailer.
+    
+    Args:
+        batch: Papers to encode
+        embeddings: Matrix with one embedding row per paper
+        
+    Returns:
+        Row bytes for COPY ... (PAPER_COLUMNS) FROM STDIN WITH (FORMAT BINARY)
+    """
+    # Convert whole columns at once; pgvector's halfvec binary format is
+    # int16 dim, int16 unused, then big-endian float2 values
+    vectors = np.ascontiguousarray(embeddings, dtype=VECTOR_DTYPE)
+    dim = vectors.shape[1]
+    vector_prefix = struct.pack("!ihh", 4 + vectors.itemsize * dim, dim, 0)
+    
+    dates = batch.dates.astype("datetime64[us]")
+    missing_dates = np.isnat(dates)
+    micros = (dates - PG_EPOCH).astype(np.int64)
+    
+    field_count = struct.pack("!h", len(PAPER_COLUMNS))
+    buf = bytearray()
+    
+    for i in range(len(batch)):
+        buf += field_count
+        _write_text(buf, batch.arxiv_ids[i])
+        _write_text(buf, batch.titles[i])
+        _write_text(buf, batch.abstracts[i])
+        _write_text_array(buf, batch.authors[i])
+        _write_text_array(buf, batch.categories[i])
+        
+        if missing_dates[i]:
+            buf += NULL_FIELD
+        else:
+            buf += struct.pack("!iq", 8, micros[i])
+            
+        buf += vector_prefix
+        buf += vectors[i].tobytes()
+        
+    return bytes(buf)
+
+
+class CopyStream:
+    """Read-only file object over byte chunks produced lazily, for copy_expert."""
+    
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._chunk = b""
+        self._pos = 0
+        
+    def read(self, size: int = -1) -> bytes:
+        """Return up to size bytes, pulling chunks only as they are needed."""
+        if size is None or size < 0:
+            data = self._chunk[self._pos:] + b"".join(self._chunks)
+            self._chunk, self._pos = b"", 0
+            return data
+            
+        out = bytearray()
+        while len(out) < size:
+            if self._pos >= len(self._chunk):
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._chunk, self._pos = chunk, 0
+                continue
+            piece = self._chunk[self._pos:self._pos + size - len(out)]
+            self._pos += len(piece)
+            out += piece
+        return bytes(out)
@@ -1,11 +1,24 @@
 """RAG (Retrieval-Augmented Generation) pipeline using Ollama."""
 
 import ollama
-from typing import Optional
+from typing import Iterator, Optional
 
+from .cache import QueryCache
 from .config import Config
 from .database import db
 from .embeddings import embedder
+from .ollama_shared import ollama_client
+
+
+PAPER_CONTEXT_TEMPLATE = (
+    "[Paper {index}]\n"
+    "Title: {title}\n"
+    "Authors: {authors}\n"
+    "arXiv ID: {arxiv_id}\n"
+    "Abstract: {abstract}\n"
+)
+
+NO_PAPERS_ANSWER = "I couldn't find any relevant papers in the database. Please try indexing some papers first."
 
 
 class RAGPipeline:
@@ -19,8 +32,9 @@ class RAGPipeline:
             llm_model: Ollama LLM model for generation
         """
         self.llm_model = llm_model or Config.OLLAMA_LLM_MODEL
-        self.client = ollama.Client(host=Config.OLLAMA_HOST)
+        self.client = ollama_client
         self.top_k = Config.TOP_K_RESULTS
+        self.embedding_cache = QueryCache(Config.EMBEDDING_CACHE_SIZE, Config.EMBEDDING_CACHE_TTL)
         
     def ensure_model(self) -> bool:
         """
@@ -42,45 +56,45 @@ class RAGPipeline:
                 print(f"Failed to pull model {self.llm_model}: {e}")
                 return False
                 
-    def retrieve(self, query: str, top_k: int = None) -> list[dict]:
+    def retrieve(self, query: str, top_k: int = None, ef_search: int = None) -> list[dict]:
         """
         Retrieve relevant papers for a query.
         
         Args:
             query: Natural language query
             top_k: Number of results to retrieve
+            ef_search: HNSW search breadth (default: db.ef_search)
             
         Returns:
             List of relevant paper dictionaries
         """
         k = top_k or self.top_k
         
-        # Generate query embedding
-        query_embedding = embedder.generate(query)
+        # Embed the normalized text the cache is keyed on, so repeats that
+        # differ only in case or spacing get the same embedding hit or miss
+        cache_key = " ".join(query.lower().split())
+        query_embedding = self.embedding_cache.get(cache_key)
+        if query_embedding is None:
+            query_embedding = embedder.generate(cache_key)
+            self.embedding_cache.set(cache_key, query_embedding)
         
         # Search for similar papers
-        results = db.search_similar(query_embedding, k)
+        results = db.search_similar(query_embedding, k, ef_search)
         
         return results
         
     def _build_context(self, papers: list[dict]) -> str:
         """Build context string from retrieved papers."""
-        context_parts = []
-        
-        for i, paper in enumerate(papers, 1):
-            authors = ", ".join(paper["authors"][:3])
-            if len(paper["authors"]) > 3:
-                authors += " et al."
-                
-            context_parts.append(
-                f"[Paper {i}]\n"
-                f"Title: {paper['title']}\n"
-                f"Authors: {authors}\n"
-                f"arXiv ID: {paper['arxiv_id']}\n"
-                f"Abstract: {paper['abstract']}\n"
+        return "\n---\n".join(
+            PAPER_CONTEXT_TEMPLATE.format(
+                index=i,
+                title=paper["title"],
+                authors=_format_authors(paper["authors"]),
+                arxiv_id=paper["arxiv_id"],
+                abstract=paper["abstract"],
             )
-            
-        return "\n---\n".join(context_parts)
+            for i, paper in enumerate(papers, 1)
+        )
         
     def _build_prompt(self, query: str, context: str) -> str:
         """Build the prompt for the LLM."""
@@ -101,6 +115,7 @@ Please provide a comprehensive answer based on the papers above:"""
         question: str,
         top_k: int = None,
         stream: bool = False,
+        ef_search: int = None,
     ):
         """
         Answer a question using RAG.
@@ -109,16 +124,17 @@ Please provide a comprehensive answer based on the papers above:"""
             question: User's question
             top_k: Number of papers to retrieve
             stream: Whether to stream the response
+            ef_search: HNSW search breadth (default: db.ef_search)
             
         Returns:
             Generated answer (or generator if streaming)
         """
         # Retrieve relevant papers
-        papers = self.retrieve(question, top_k)
+        papers = self.retrieve(question, top_k, ef_search)
         
         if not papers:
             return {
-                "answer": "I couldn't find any relevant papers in the database. Please try indexing some papers first.",
+                "answer": NO_PAPERS_ANSWER,
                 "sources": [],
             }
             
@@ -131,6 +147,42 @@ Please provide a comprehensive answer based on the papers above:"""
         else:
             return self._generate_response(prompt, papers)
             
+    def query_stream(
+        self,
+        question: str,
+        top_k: int = None,
+        papers: Optional[list[dict]] = None,
+        ef_search: int = None,
+    ) -> Iterator[str]:
+        """
+        Answer a question using RAG, yielding answer text as it is generated.
+        
+        Args:
+            question: User's question
+            top_k: Number of papers to retrieve
+            papers: Already retrieved papers to use instead of searching again
+            ef_search: HNSW search breadth (default: db.ef_search)
+            
+        Yields:
+            Chunks of the generated answer
+        """
+        if papers is None:
+            papers = self.retrieve(question, top_k, ef_search)
+            
+        if not papers:
+            yield NO_PAPERS_ANSWER
+            return
+            
+        prompt = self._build_prompt(question, self._build_context(papers))
+        stream = self.client.generate(
+            model=self.llm_model,
+            prompt=prompt,
+            stream=True,
+        )
+        
+        for chunk in stream:
+            yield chunk["response"]
+            
     def _generate_response(self, prompt: str, papers: list[dict]) -> dict:
         """Generate a complete response."""
         response = self.client.generate(
@@ -140,14 +192,7 @@ Please provide a comprehensive answer based on the papers above:"""
         
         return {
             "answer": response["response"],
-            "sources": [
-                {
-                    "arxiv_id": p["arxiv_id"],
-                    "title": p["title"],
-                    "similarity": p.get("similarity", 0),
-                }
-                for p in papers
-            ],
+            "sources": self._sources(papers),
         }
         
     def _stream_response(self, prompt: str, papers: list[dict]):
@@ -158,19 +203,33 @@ Please provide a comprehensive answer based on the papers above:"""
             stream=True,
         )
         
+        # Built once; only the final chunk carries it
+        sources = self._sources(papers)
+        
         for chunk in stream:
+            done = chunk.get("done", False)
             yield {
                 "token": chunk["response"],
-                "done": chunk.get("done", False),
-                "sources": [
-                    {
-                        "arxiv_id": p["arxiv_id"],
-                        "title": p["title"],
-                        "similarity": p.get("similarity", 0),
-                    }
-                    for p in papers
-                ] if chunk.get("done", False) else None,
+                "done": done,
+                "sources": sources if done else None,
             }
+            
+    @staticmethod
+    def _sources(papers: list[dict]) -> list[dict]:
+        """Summarize retrieved papers as the sources attached to an answer."""
+        return [
+            {
+                "arxiv_id": p["arxiv_id"],
+                "title": p["title"],
+                "similarity": p.get("similarity", 0),
+            }
+            for p in papers
+        ]
+
+
+def _format_authors(authors: list[str]) -> str:
+    """Show the first three authors, then "et al."."""
+    return ", ".join(authors[:3]) + (" et al." if len(authors) > 3 else "")
 
 
 # Singleton instance
@@ -0,0 +1,184 @@
+"""Custom CSS for the Streamlit UI, minified once at import."""
+
+import re
+
+
+CSS = """
+    @import url('https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;600&family=Outfit:wght@300;400;600;700&display=swap');
+    
+    :root {
+        --bg-primary: #0d1117;
+        --bg-secondary: #161b22;
+        --bg-tertiary: #21262d;
+        --accent-cyan: #58a6ff;
+        --accent-purple: #bc8cff;
+        --accent-green: #3fb950;
+        --accent-orange: #d29922;
+        --text-primary: #e6edf3;
+        --text-secondary: #8b949e;
+        --border-color: #30363d;
+    }
+    
+    .stApp {
+        background: linear-gradient(135deg, var(--bg-primary) 0%, #0a0f14 100%);
+    }
+    
+    .main-header {
+        font-family: 'Outfit', sans-serif;
+        font-weight: 700;
+        font-size: 3rem;
+        background: linear-gradient(135deg, var(--accent-cyan) 0%, var(--accent-purple) 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+        margin-bottom: 0.5rem;
+    }
+    
+    .sub-header {
+        font-family: 'Outfit', sans-serif;
+        color: var(--text-secondary);
+        font-size: 1.1rem;
+        margin-bottom: 2rem;
+    }
+    
+    .paper-card {
+        background: var(--bg-secondary);
+        border: 1px solid var(--border-color);
+        border-radius: 12px;
+        padding: 1.5rem;
+        margin-bottom: 1rem;
+        transition: all 0.3s ease;
+    }
+    
+    .paper-card:hover {
+        border-color: var(--accent-cyan);
+        box-shadow: 0 0 20px rgba(88, 166, 255, 0.1);
+    }
+    
+    .paper-title {
+        font-family: 'Outfit', sans-serif;
+        font-weight: 600;
+        color: var(--text-primary);
+        font-size: 1.1rem;
+        margin-bottom: 0.5rem;
+    }
+    
+    .paper-meta {
+        font-family: 'JetBrains Mono', monospace;
+        font-size: 0.75rem;
+        color: var(--accent-cyan);
+        margin-bottom: 0.75rem;
+    }
+    
+    .paper-abstract {
+        color: var(--text-secondary);
+        font-size: 0.9rem;
+        line-height: 1.6;
+    }
+    
+    .similarity-badge {
+        display: inline-block;
+        background: linear-gradient(135deg, var(--accent-green) 0%, #238636 100%);
+        color: white;
+        padding: 0.25rem 0.75rem;
+        border-radius: 20px;
+        font-size: 0.75rem;
+        font-weight: 600;
+        font-family: 'JetBrains Mono', monospace;
+    }
+    
+    .stat-card {
+        background: var(--bg-secondary);
+        border: 1px solid var(--border-color);
+        border-radius: 12px;
+        padding: 1.5rem;
+        text-align: center;
+    }
+    
+    .stat-value {
+        font-family: 'JetBrains Mono', monospace;
+        font-size: 2.5rem;
+        font-weight: 600;
+        color: var(--accent-cyan);
+    }
+    
+    .stat-label {
+        font-family: 'Outfit', sans-serif;
+        color: var(--text-secondary);
+        font-size: 0.9rem;
+    }
+    
+    .answer-box {
+        background: var(--bg-secondary);
+        border: 1px solid var(--accent-purple);
+        border-radius: 12px;
+        padding: 1.5rem;
+        margin: 1rem 0;
+    }
+    
+    .source-tag {
+        display: inline-block;
+        background: var(--bg-tertiary);
+        border: 1px solid var(--border-color);
+        color: var(--accent-orange);
+        padding: 0.25rem 0.5rem;
+        border-radius: 6px;
+        font-size: 0.7rem;
+        font-family: 'JetBrains Mono', monospace;
+        margin-right: 0.5rem;
+        margin-bottom: 0.25rem;
+    }
+    
+    div[data-testid="stSidebar"] {
+        background: var(--bg-secondary);
+        border-right: 1px solid var(--border-color);
+    }
+    
+    .stTextInput > div > div > input {
+        background: var(--bg-tertiary);
+        border: 1px solid var(--border-color);
+        color: var(--text-primary);
+        border-radius: 8px;
+    }
+    
+    .stTextArea > div > div > textarea {
+        background: var(--bg-tertiary);
+        border: 1px solid var(--border-color);
+        color: var(--text-primary);
+        border-radius: 8px;
+    }
+    
+    .stSelectbox > div > div {
+        background: var(--bg-tertiary);
+        border: 1px solid var(--border-color);
+        border-radius: 8px;
+    }
+    
+    .stButton > button {
+        background: linear-gradient(135deg, var(--accent-cyan) 0%, var(--accent-purple) 100%);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        font-family: 'Outfit', sans-serif;
+        font-weight: 600;
+        padding: 0.5rem 1.5rem;
+        transition: all 0.3s ease;
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 4px 20px rgba(88, 166, 255, 0.3);
+    }
+"""
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+# Ready-to-inject <style> block, built once per process
+CSS_STYLE_TAG = f"<style>{minify_css(CSS)}</style>"